@@ -7,6 +7,7 @@
     "use_global_liblzma%": "<!(node -p \"process.env.USE_GLOBAL || (!os.type().startsWith('Win'))\")",
     "runtime_link%": "<!(node -p \"process.env.RUNTIME_LINK?.length > 0 ? process.env.RUNTIME_LINK : (!os.type().startsWith('Win') ? 'shared' : 'static')\")",
     "enable_thread_support%": "<!(node -p \"process.env.ENABLE_THREAD_SUPPORT || 'yes'\")",
+    "build_jobs%": "<!(node -p \"process.env.BUILD_JOBS || os.availableParallelism?.() || os.cpus().length\")",
     "xz_vendor_dir": "<(module_root_dir)/deps/xz",
     "py3": "<!(node -p \"process.env.npm_config_python || 'python3'\")",
     "target_dir": "<(module_root_dir)/build"
@@ -503,8 +504,8 @@
                 "sh",
                 "-c",
                 "cd <(xz_vendor_dir) && ./configure --enable-static --enable-shared --disable-scripts --disable-lzmainfo \
-                --disable-lzma-links --disable-lzmadec --disable-xzdec --disable-xz --disable-rpath --enable-threads=<(enable_thread_support) \
-                --disable-dependency-tracking --prefix=\"<(target_dir)/liblzma\" && make && make install"
+                --disable-lzma-links --disable-lzmadec --disable-xzdec --disable-xz --disable-rpath --disable-nls --disable-doc --enable-threads=<(enable_thread_support) \
+                --disable-dependency-tracking --prefix=\"<(target_dir)/liblzma\" && make -j<(build_jobs) install"
               ]
             }]
           }]
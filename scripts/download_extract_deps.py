@@ -1,28 +1,97 @@
 import urllib.request
+import http.client
+import hashlib
+import shutil
 import sys
 import tarfile
+import time
 import os
 
 url = 'https://tukaani.org/xz/xz-5.2.5.tar.xz'
+sha256 = '3e1e518ffc912f86608a8cb35e4bd41ad1aec210df2a47aaa1f95e7f5576ef56'
+timeout = 30
 tarball = os.path.abspath(sys.argv[1])
 dirname = os.path.abspath(sys.argv[2])
 
 def members(tf):
-    for member in tf.getmembers():
+    for member in tf:
         member.path = member.path.replace('xz-5.2.5', 'xz')
         yield member
 
+def file_sha256(path):
+    with open(path, 'rb') as f:
+        # hashlib.file_digest is only available since Python 3.11
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(256 * 1024), b''):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+def download(url, path, tries=3):
+    # download next to the target and only move it in place once complete,
+    # so that an interrupted transfer never leaves a truncated tarball behind
+    part = path + '.part'
+    for attempt in range(tries):
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                # scale copy buffer with the archive size, between 256 KiB and 1 MiB
+                total = int(response.headers.get('Content-Length', 0))
+                length = max(256 * 1024, min(1024 * 1024, total // 100))
+                with open(part, 'wb') as f:
+                    shutil.copyfileobj(response, f, length=length)
+                    size = f.tell()
+            if total and size != total:
+                raise OSError('got {} of {} bytes'.format(size, total))
+            os.replace(part, path)
+            print('Downloaded', size, 'bytes to', path)
+            return
+        # URLError and socket timeouts are OSError, IncompleteRead is an HTTPException
+        except (OSError, http.client.HTTPException) as e:
+            if attempt == tries - 1:
+                if os.path.exists(part):
+                    os.remove(part)
+                raise
+            delay = 2 ** attempt
+            print('Download failed ({}), retrying in {}s'.format(e, delay))
+            time.sleep(delay)
+
+# avoid redownload and re-extraction if sources already come from this very tarball
+xz_dir = os.path.join(dirname, 'xz')
+stamp = os.path.join(xz_dir, '.nlzma_src_digest')
+if os.path.exists(stamp):
+    with open(stamp) as f:
+        if f.read().strip() == sha256:
+            print('Not extracting tarball,', xz_dir, 'is already up to date.')
+            sys.exit(0)
+
 # avoid redownload if tarball already exist
 if os.path.exists(tarball):
     print('Not downloading file, tarball', tarball, 'already exists.')
 else:
     print('Downloading archive from ', url)
-    with urllib.request.urlopen(url) as response:
-        with open(tarball, 'wb') as f:
-            f.write(response.read())
+    download(url, tarball)
+
+# never extract a corrupted or tampered archive, drop it so next run downloads it again
+digest = file_sha256(tarball)
+if digest != sha256:
+    print('Checksum mismatch for', tarball, ': expected', sha256, 'got', digest)
+    os.remove(tarball)
+    sys.exit(1)
+
+shutil.rmtree(xz_dir, ignore_errors=True)
+
+# stream mode: members are extracted as they are decompressed, in one pass
+# (1 MiB reads instead of the 10 KiB default keep the decompressor busy)
+with tarfile.open(tarball, 'r|xz', bufsize=1024 * 1024) as tfile:
+    # 'data' filter refuses absolute paths, links escaping dirname and special files
+    if hasattr(tarfile, 'data_filter'):
+        tfile.extractall(dirname, members=members(tfile), filter='data')
+    else:
+        tfile.extractall(dirname, members=members(tfile))
 
-tfile = tarfile.open(tarball,'r:xz')
-tfile.extractall(dirname, members=members(tfile))
+with open(stamp, 'w') as f:
+    f.write(digest)
 
 print('Finished extracting tarball to ', dirname)
 
@@ -9,5 +9,6 @@ target = os.path.abspath(sys.argv[2])
 target_dirname = os.path.dirname(target)
 os.makedirs(target_dirname, exist_ok=True)
 
-# We probably do not need the extra metadata info but that does not hurt
-shutil.copy2(source, target)
\ No newline at end of file
+# We do not need the extra metadata info, only bytes and permission bits
+shutil.copyfile(source, target)
+shutil.copymode(source, target)
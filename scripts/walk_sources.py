@@ -1,7 +1,24 @@
-import os;
-import sys;
+import os
+import sys
 
-for (dirpath, dirnames, filenames) in os.walk(sys.argv[1]):
-    for filename in filenames:
-        if filename.endswith(('.cc', '.cpp', '.h', '.hpp', '.c')): 
-            print('/'.join([dirpath.replace(os.sep, '/'), filename]))
\ No newline at end of file
+extensions = frozenset(('.cc', '.cpp', '.h', '.hpp', '.c'))
+
+# Same output order as os.walk (files first, then subdirectories) but
+# relying on scandir cached entry types instead of stat-ing every entry
+def walk(dirpath, sources):
+    subdirs = []
+    with os.scandir(dirpath) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                # like os.walk, do not descend into symlinked directories
+                if not entry.is_symlink():
+                    subdirs.append(entry.path)
+            elif os.path.splitext(entry.name)[1] in extensions:
+                sources.append('/'.join([dirpath.replace(os.sep, '/'), entry.name]) + '\n')
+    for subdir in subdirs:
+        walk(subdir, sources)
+
+# Emit the whole list at once rather than one print (and write) per file
+sources = []
+walk(sys.argv[1], sources)
+sys.stdout.writelines(sources)